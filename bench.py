@@ -0,0 +1,380 @@
+"""
+Бенчмарки стратегии и хелперов trader.py на заготовленных ответах Bybit (без сети).
+
+    python bench.py                    # прогон и сравнение с bench_baseline.json
+    python bench.py --save-baseline    # сохранить текущие результаты как базу
+    python bench.py --threshold 0.3    # допустимое ухудшение (по умолчанию 25%)
+
+Время – медиана по серии повторов. Замер считается регрессией, только если
+он хуже базы больше чем на threshold и одновременно дальше шума: разброса
+базы (3×IQR) и абсолютного порога NOISE_FLOOR_*. Отмеченные замеры
+перемеряются до RETRIES раз, в зачёт идёт лучший результат.
+Код выхода 1, если регрессия осталась после перемеров.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+import types
+from pathlib import Path
+from unittest import mock
+
+
+BASELINE_FILE = Path(__file__).with_name("bench_baseline.json")
+
+REPEAT = 21            # серий на замер, по ним считается медиана
+RETRIES = 2            # перемеров для замеров, похожих на регрессию
+NOISE_FLOOR_US = 5.0   # изменения времени меньше этого – шум
+NOISE_FLOOR_KB = 16.0  # изменения пиковой памяти меньше этого – шум
+
+# Фиксированные параметры вместо пользовательского settings.py,
+# чтобы результаты не зависели от конфигурации на конкретной машине
+BENCH_SETTINGS = {
+    "SYMBOL": "XRPUSDT",
+    "INTERVAL": "1",
+    "DEMO": True,
+    "EMA_FAST": 50,
+    "EMA_SLOW": 200,
+    "POSITION_SIZE": 0.1,
+    "TAKE_PROFIT": 0.01,
+    "COMMISSION_RATE": 0.001,
+    "DCA_GRID": [1, 2, 4],
+    "DCA_STEP": 0.01,
+    "ONLY_LONG": False,
+}
+
+try:
+    import settings
+except ImportError:
+    settings = types.ModuleType("settings")
+    sys.modules["settings"] = settings
+for _name, _value in BENCH_SETTINGS.items():
+    setattr(settings, _name, _value)
+
+from loguru import logger
+
+import strategy
+import trader
+from strategy import TradingBot
+
+
+# --- Заготовленные ответы Bybit --- #
+def make_klines(count: int, seed: int = 42) -> list:
+    """
+    Детерминированные свечи в формате Bybit get_kline:
+    строки [start, open, high, low, close, volume, turnover], новые первыми.
+
+    Плавный рост 0.490 → 0.512 с небольшим шумом: EMA_FAST выше EMA_SLOW,
+    последнее закрытие рядом с ценой тикера CannedSession.
+    """
+    rnd = random.Random(seed)
+    start = 1_735_689_600_000  # 2025-01-01 00:00 UTC
+    price = 0.49
+    rows = []
+    for i in range(count):
+        open_ = price
+        price = 0.49 + 0.022 * i / max(count - 1, 1) + rnd.gauss(0, 0.0003)
+        high = max(open_, price) + abs(rnd.gauss(0, 0.001))
+        low = min(open_, price) - abs(rnd.gauss(0, 0.001))
+        volume = rnd.uniform(1e4, 1e6)
+        rows.append([
+            str(start + i * 60_000),
+            f"{open_:.4f}",
+            f"{high:.4f}",
+            f"{low:.4f}",
+            f"{price:.4f}",
+            f"{volume:.0f}",
+            f"{volume * price:.4f}",
+        ])
+    rows.reverse()
+    return rows
+
+
+class CannedSession:
+    """Подмена pybit HTTP: те же методы, ответы без обращения к сети."""
+
+    def __init__(self, klines: list):
+        self.klines = klines
+
+    def get_kline(self, **kwargs):
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": self.klines[:kwargs["limit"]]}}
+
+    def get_tickers(self, **kwargs):
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": [{"lastPrice": "0.5123"}]}}
+
+    def get_orderbook(self, **kwargs):
+        return {"retCode": 0, "retMsg": "OK", "result": {"b": [["0.5122", "15000"]], "a": [["0.5124", "12000"]]}}
+
+    def get_positions(self, **kwargs):
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": [
+            {"size": "100", "side": "Buy", "avgPrice": "0.5100", "unrealisedPnl": "0.23"}
+        ]}}
+
+    def get_wallet_balance(self, **kwargs):
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": [{"coin": [{"equity": "1000.0"}]}]}}
+
+    def get_instruments_info(self, **kwargs):
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": [{
+            "lotSizeFilter": {"minOrderQty": "1", "qtyStep": "1"},
+            "priceFilter": {"tickSize": "0.0001"},
+        }]}}
+
+    def place_order(self, **kwargs):
+        return {"retCode": 0, "retMsg": "OK", "result": {"orderId": "bench"}}
+
+
+class RecordingTelegram:
+    """Заглушка telebot.TeleBot: запоминает тексты сообщений."""
+
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, chat_id, text, **kwargs):
+        self.messages.append(text)
+
+
+# --- Замеры --- #
+def measure(fn, repeat: int = REPEAT) -> dict:
+    """
+    Время одного вызова: медиана и межквартильный размах (IQR) по repeat
+    сериям, каждая ~0.2 с. Пиковая память одного вызова по tracemalloc.
+    """
+    fn()  # прогрев
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    q1, _, q3 = statistics.quantiles(runs, n=4)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"time_us": statistics.median(runs), "spread_us": q3 - q1, "peak_kb": peak / 1024}
+
+
+def prime_bot(bot: TradingBot):
+    """
+    Одинаковое состояние перед каждой итерацией: открытый лонг по 0.51,
+    новая свеча. При ценах CannedSession тренд long, цена 0.5123 ниже
+    TP (0.5151) и выше уровня DCA (0.50) – ничего не срабатывает.
+    """
+    bot.last_bar_time = None
+    bot.in_position = True
+    bot.position_side = "Buy"
+    bot.base_price = 0.51
+    bot.dca_index = 0
+    bot.limit_order_plased = False
+    bot.is_message_TP = True
+    bot.is_message_dca = True
+    bot.is_message_trend_change = False
+
+
+def check_steady_state(bot: TradingBot, telegram: RecordingTelegram):
+    """
+    Итерация должна пройти путь «в позиции, ничего не срабатывает».
+    Иначе замер не соответствует базе – прерываем прогон.
+    """
+    errors = [m for m in telegram.messages if m.startswith("[ERROR]")]
+    if errors:
+        raise RuntimeError(f"TradingBot.run упал на заготовленных данных: {errors[0]}")
+    if telegram.messages:
+        raise RuntimeError(f"TradingBot.run сработал вместо холостой итерации: {telegram.messages[0]}")
+    if not bot.in_position or bot.dca_index != 0 or bot.last_trend != "long":
+        raise RuntimeError(
+            f"Неожиданное состояние после итерации: in_position={bot.in_position}, "
+            f"dca_index={bot.dca_index}, trend={bot.last_trend}"
+        )
+
+
+def run_benchmarks(only: set | None = None) -> dict:
+    """
+    Прогон замеров (всех или только имён из only).
+    Возврат: {имя: {"time_us", "spread_us", "peak_kb"}}
+    """
+    symbol = settings.SYMBOL
+    session = CannedSession(make_klines(1000))
+    trader.session = session
+    trader.SYMBOL_SPECS.clear()
+    trader.get_symbol_specs(symbol)
+
+    results = {}
+
+    def wanted(name: str) -> bool:
+        return only is None or name in only
+
+    for limit in (50, 200, 1000):
+        if wanted(f"fetch_klines[{limit}]"):
+            results[f"fetch_klines[{limit}]"] = measure(
+                lambda: trader.fetch_klines(symbol, limit=limit)
+            )
+
+    df = trader.fetch_klines(symbol, limit=1000)
+    for fast, slow in ((9, 21), (50, 200), (200, 500)):
+        if wanted(f"compute_ema[{fast}/{slow}]"):
+            results[f"compute_ema[{fast}/{slow}]"] = measure(
+                lambda: trader.compute_ema(df, fast, slow)
+            )
+
+    if wanted("calc_order_qty"):
+        results["calc_order_qty"] = measure(lambda: trader.calc_order_qty(symbol, settings.POSITION_SIZE))
+    if wanted("place_limit_best"):
+        results["place_limit_best"] = measure(lambda: trader.place_limit_best("Buy", 97.3, symbol))
+
+    if not wanted("TradingBot.run"):
+        return results
+
+    # Итерация стратегии без паузы между итерациями
+    logger.remove()
+    telegram = RecordingTelegram()
+    bot = TradingBot(tg_bot=telegram, chat_id=None, markup=None, logger=logger)
+
+    def iteration():
+        prime_bot(bot)
+        bot.run(True)
+
+    # Подменяем только ссылку strategy.time, глобальный time.sleep не трогаем
+    with mock.patch.object(strategy, "time", types.SimpleNamespace(sleep=lambda seconds: None)):
+        iteration()
+        check_steady_state(bot, telegram)
+        results["TradingBot.run"] = measure(iteration)
+        check_steady_state(bot, telegram)
+
+    return results
+
+
+# --- Сравнение с базой --- #
+def _delta(current: float, base: float | None) -> str:
+    if not base:
+        return "-"
+    return f"{(current / base - 1) * 100:+.1f}%"
+
+
+def status(cur: dict, base: dict, threshold: float) -> str:
+    """
+    Статус замера относительно базы: ok | new | SLOWER | MORE MEM | SLOWER+MEM.
+    Ухудшение засчитывается, только если оно больше threshold
+    и больше шума (3×IQR базы, но не меньше NOISE_FLOOR_*).
+    """
+    if not base:
+        return "new"
+
+    base_time = base.get("time_us")
+    noise_us = max(NOISE_FLOOR_US, 3 * base.get("spread_us", 0.0))
+    slower = bool(base_time) and (
+        cur["time_us"] > base_time * (1 + threshold)
+        and cur["time_us"] - base_time > noise_us
+    )
+
+    base_peak = base.get("peak_kb")
+    more_mem = bool(base_peak) and (
+        cur["peak_kb"] > base_peak * (1 + threshold)
+        and cur["peak_kb"] - base_peak > NOISE_FLOOR_KB
+    )
+
+    if slower and more_mem:
+        return "SLOWER+MEM"
+    if slower:
+        return "SLOWER"
+    if more_mem:
+        return "MORE MEM"
+    return "ok"
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> set:
+    return {
+        name for name, cur in results.items()
+        if status(cur, baseline.get(name, {}), threshold) not in ("ok", "new")
+    }
+
+
+def remeasure(results: dict, baseline: dict, threshold: float) -> dict:
+    """
+    Перемеряет замеры, похожие на регрессию, до RETRIES раз.
+    По каждой метрике остаётся лучший результат из всех попыток.
+    """
+    results = dict(results)
+    for _ in range(RETRIES):
+        flagged = find_regressions(results, baseline, threshold)
+        if not flagged:
+            break
+        print(f"Перемер: {', '.join(sorted(flagged))}")
+        for name, again in run_benchmarks(flagged).items():
+            cur = results[name]
+            if again["time_us"] < cur["time_us"]:
+                cur = {**cur, "time_us": again["time_us"], "spread_us": again["spread_us"]}
+            cur = {**cur, "peak_kb": min(cur["peak_kb"], again["peak_kb"])}
+            results[name] = cur
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Печатает таблицу сравнения. Возврат: список имён с регрессией."""
+    regressions = []
+    header = (
+        f"{'benchmark':<24}{'time, us':>12}{'± IQR':>10}{'base':>12}{'delta':>9}"
+        f"{'peak, KiB':>12}{'base':>12}{'delta':>9}  status"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for name, cur in results.items():
+        base = baseline.get(name, {})
+        base_time = base.get("time_us")
+        base_peak = base.get("peak_kb")
+
+        state = status(cur, base, threshold)
+        if state not in ("ok", "new"):
+            regressions.append(name)
+
+        print(
+            f"{name:<24}"
+            f"{cur['time_us']:>12.1f}{cur['spread_us']:>10.1f}"
+            f"{base_time or 0:>12.1f}{_delta(cur['time_us'], base_time):>9}"
+            f"{cur['peak_kb']:>12.1f}{base_peak or 0:>12.1f}{_delta(cur['peak_kb'], base_peak):>9}"
+            f"  {state}"
+        )
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки торгового бота (офлайн)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="файл с базовыми результатами")
+    parser.add_argument("--save-baseline", action="store_true", help="записать текущие результаты как базу")
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустимое ухудшение, доля (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = run_benchmarks()
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        if not args.save_baseline:
+            results = remeasure(results, baseline, args.threshold)
+
+    regressions = compare(results, baseline, args.threshold)
+    print(f"\n{len(results)} замеров за {time.perf_counter() - started:.1f} с, порог {args.threshold:.0%}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "python": sys.version.split()[0],
+            "results": results,
+        }, indent=2), encoding="utf-8")
+        print(f"База сохранена: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("База не найдена: запустите с --save-baseline")
+    if regressions:
+        print(f"Регрессии: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,189 @@
+import struct
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Tuple
+
+
+# --- Формат записи --- #
+# Заголовок файла + фиксированные записи little-endian:
+#   ts_ms (int64), price, ema_fast, ema_slow (float64),
+#   decision (uint8), dca_index (uint8), trend (int8)
+MAGIC = b"TRJ1"
+RECORD = struct.Struct("<qdddBBb")
+
+# Коды решений стратегии на тике
+DECISION_NONE = 0
+DECISION_ENTRY_LONG = 1
+DECISION_ENTRY_SHORT = 2
+DECISION_TP_EXIT = 3
+DECISION_NOT_LOSS_EXIT = 4
+DECISION_DCA = 5
+
+DECISION_NAMES = {
+    DECISION_NONE: "-",
+    DECISION_ENTRY_LONG: "ENTRY_LONG",
+    DECISION_ENTRY_SHORT: "ENTRY_SHORT",
+    DECISION_TP_EXIT: "TP_EXIT",
+    DECISION_NOT_LOSS_EXIT: "NOT_LOSS_EXIT",
+    DECISION_DCA: "DCA",
+}
+
+TREND_CODES = {"long": 1, "short": -1, "flat": 0, None: 0}
+TREND_NAMES = {1: "long", -1: "short", 0: "flat"}
+
+
+class TickJournal:
+    """
+    Компактный бинарный журнал тиков: цена, EMA и решение стратегии.
+
+    Один файл в день (logs/ticks_YYYYMMDD.bin), запись – 35 байт.
+    Сброс на диск раз в flush_every записей или сразу при решении.
+    Файлы старше keep_days дней удаляются при смене дня (0 – хранить все).
+
+    Проверка формата: python -m doctest journal.py
+
+    >>> import tempfile
+    >>> tmp = tempfile.TemporaryDirectory()
+    >>> (Path(tmp.name) / "ticks_20000101.bin").write_bytes(MAGIC)
+    4
+    >>> j = TickJournal(tmp.name)
+    >>> j.record(0.51, 0.50, 0.49, DECISION_DCA, 1, "long"); j.close()
+    >>> [p.name for p in Path(tmp.name).glob("ticks_2000*.bin")]  # старый файл удалён
+    []
+    >>> path = next(Path(tmp.name).glob("ticks_*.bin"))
+    >>> with open(path, "ab") as f: _ = f.write(b"torn tail")  # обрыв записи
+    >>> j = TickJournal(tmp.name)
+    >>> j.record(0.52, 0.51, 0.50, DECISION_TP_EXIT, 0, "long"); j.close()
+    >>> [(r[1], r[4], r[5], r[6]) for r in read_journal(path)]
+    [(0.51, 'DCA', 1, 'long'), (0.52, 'TP_EXIT', 0, 'long')]
+    >>> tmp.cleanup()
+    """
+
+    def __init__(self, logs_dir: str = "logs", flush_every: int = 20, keep_days: int = 7):
+        self.logs_dir = Path(logs_dir)
+        self.logs_dir.mkdir(exist_ok=True)
+        self.flush_every = flush_every
+        self.keep_days = keep_days
+        self._file = None
+        self._day = None
+        self._pending = 0
+
+    def _open(self, day: str):
+        """
+        Открывает (или продолжает) файл журнала за день.
+
+        Хвост от оборванной записи обрезается до границы записи,
+        иначе всё дописанное после него читалось бы со сдвигом.
+        """
+        self.close()
+        path = self.logs_dir / f"ticks_{day}.bin"
+        size = path.stat().st_size if path.exists() else 0
+
+        if size >= len(MAGIC):
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{path}: не является журналом тиков")
+            records = (size - len(MAGIC)) // RECORD.size
+            valid = len(MAGIC) + records * RECORD.size
+        else:
+            valid = 0  # пустой файл или оборванный заголовок
+
+        self._file = open(path, "ab")
+        if valid != size:
+            self._file.truncate(valid)
+        if valid == 0:
+            self._file.write(MAGIC)
+        self._day = day
+        self._prune(day)
+
+    def _prune(self, day: str):
+        """Удаляет файлы журнала старше keep_days дней."""
+        if not self.keep_days:
+            return
+        cutoff = (datetime.strptime(day, "%Y%m%d") - timedelta(days=self.keep_days)).strftime("%Y%m%d")
+        for path in self.logs_dir.glob("ticks_*.bin"):
+            if path.stem[len("ticks_"):] < cutoff:
+                path.unlink(missing_ok=True)
+
+    def record(self, price: float, ema_fast: float, ema_slow: float,
+               decision: int = DECISION_NONE, dca_index: int = 0, trend: str | None = None):
+        """Добавить запись о тике."""
+        now = datetime.now()
+        day = now.strftime("%Y%m%d")
+        if day != self._day:
+            self._open(day)
+
+        self._file.write(RECORD.pack(
+            int(now.timestamp() * 1000),
+            float(price),
+            float(ema_fast),
+            float(ema_slow),
+            decision,
+            min(dca_index, 255),
+            TREND_CODES.get(trend, 0),
+        ))
+        self._pending += 1
+
+        if decision != DECISION_NONE or self._pending >= self.flush_every:
+            self._file.flush()
+            self._pending = 0
+
+    def close(self):
+        """Сбросить буфер и закрыть файл."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._pending = 0
+
+
+def read_journal(path: str) -> Iterator[Tuple[datetime, float, float, float, str, int, str]]:
+    """
+    Читает журнал тиков.
+
+    Возврат: (time, price, ema_fast, ema_slow, decision, dca_index, trend)
+    Неполная последняя запись (обрыв при записи) пропускается.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: не является журналом тиков")
+        while True:
+            chunk = f.read(RECORD.size)
+            if len(chunk) < RECORD.size:
+                break
+            ts_ms, price, ema_fast, ema_slow, decision, dca_index, trend = RECORD.unpack(chunk)
+            yield (
+                datetime.fromtimestamp(ts_ms / 1000),
+                price,
+                ema_fast,
+                ema_slow,
+                DECISION_NAMES.get(decision, str(decision)),
+                dca_index,
+                TREND_NAMES.get(trend, str(trend)),
+            )
+
+
+def main(argv: list[str]):
+    """
+    Вывод журнала в CSV:
+        python journal.py logs/ticks_20250101.bin [--decisions]
+
+    --decisions – только тики с решениями стратегии
+    """
+    paths = [a for a in argv if not a.startswith("--")]
+    only_decisions = "--decisions" in argv
+    if not paths:
+        print(main.__doc__.strip())
+        return 1
+
+    print("time,price,ema_fast,ema_slow,decision,dca_index,trend")
+    for path in paths:
+        for t, price, ema_fast, ema_slow, decision, dca_index, trend in read_journal(path):
+            if only_decisions and decision == DECISION_NAMES[DECISION_NONE]:
+                continue
+            print(f"{t:%Y-%m-%d %H:%M:%S.%f},{price},{ema_fast},{ema_slow},{decision},{dca_index},{trend}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,17 +1,44 @@
 from loguru import logger
+import json
 import sys
 from datetime import datetime
 from pathlib import Path
 
-def setup_logging():
-    """Настройка логирования с rotation и retention"""
+def _json_format(record) -> str:
+    """
+    Компактная JSON-строка: время, уровень, сообщение и поля из bind().
+    Стандартный serialize=True пишет весь record (~700 байт на строку).
+    """
+    data = {
+        "time": record["time"].strftime("%Y-%m-%d %H:%M:%S"),
+        "level": record["level"].name,
+        "message": record["message"],
+    }
+    extra = {k: v for k, v in record["extra"].items() if k != "json"}
+    if extra:
+        data["extra"] = extra
+    if record["exception"] is not None:
+        data["exception"] = repr(record["exception"].value)
+    record["extra"]["json"] = json.dumps(data, ensure_ascii=False, default=str)
+    return "{extra[json]}\n"
+
+def setup_logging(enqueue: bool = True, serialize: bool = True):
+    """
+    Настройка логирования с rotation и retention.
+
+    • enqueue   – запись через очередь loguru: I/O и ротация/сжатие
+                  выполняются в отдельном потоке, а не в торговом цикле
+    • serialize – писать файл в JSON (по записи на строку): time, level,
+                  message и поля из logger.bind(...) в extra
+    """
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
-    
-    log_file = logs_dir / f"bot_{datetime.now().strftime('%Y%m%d')}.log"
-    
+
+    suffix = "jsonl" if serialize else "log"
+    log_file = logs_dir / f"bot_{datetime.now().strftime('%Y%m%d')}.{suffix}"
+
     logger.remove()  # Удаляем все предыдущие обработчики
-    
+
     # Конфигурация логирования в файл
     logger.add(
         log_file,
@@ -19,14 +46,16 @@ def setup_logging():
         retention="7 days",  # Хранение логов 7 дней
         compression="zip",  # Сжатие старых логов
         level="INFO",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
+        format=_json_format if serialize else "{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+        enqueue=enqueue,
     )
-    
+
     # Конфигурация логирования в консоль
     logger.add(
         sys.stdout,
         level="INFO",
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | <cyan>{message}</cyan>"
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | <cyan>{message}</cyan>",
+        enqueue=enqueue,
     )
-    
+
     return logger
@@ -5,6 +5,7 @@ from strategy import TradingBot
 from trader import get_symbol_specs, close_position
 import settings as cfg
 from logger import setup_logging
+from journal import TickJournal
 import os
 import telebot
 from telebot import types
@@ -101,8 +102,11 @@ def main():
     # Запуск Telegram бота в отдельном потоке
     telegram_thread = threading.Thread(target=telegram_polling, args=(logger,), daemon=True)
     telegram_thread.start()
+    # Бинарный журнал тиков (TICK_JOURNAL=1 в .env)
+    journal = TickJournal() if os.getenv("TICK_JOURNAL") == "1" else None
+
     # Создаём и запускаем стратегию
-    traiding_bot = TradingBot(tg_bot=bot, chat_id=chat_id, markup=markup, logger=logger)
+    traiding_bot = TradingBot(tg_bot=bot, chat_id=chat_id, markup=markup, logger=logger, journal=journal)
 
     while True:
         try:
@@ -119,5 +123,9 @@ def main():
             logger.error(f"Ошибка: {e}")
             break
 
+    if traiding_bot.journal is not None:  # None, если журнал отключился из-за ошибки
+        traiding_bot.journal.close()
+    logger.complete()  # Дождаться записи очереди логов
+
 if __name__ == "__main__":
     main()
@@ -13,13 +13,23 @@ from trader import (
     calc_order_qty
 )
 from settings import ONLY_LONG
+from journal import (
+    DECISION_NONE,
+    DECISION_ENTRY_LONG,
+    DECISION_ENTRY_SHORT,
+    DECISION_TP_EXIT,
+    DECISION_NOT_LOSS_EXIT,
+    DECISION_DCA,
+)
 
 class TradingBot:
-    def __init__(self, tg_bot, chat_id, markup, logger):
+    def __init__(self, tg_bot, chat_id, markup, logger, journal=None):
         self.tg_bot = tg_bot
         self.chat_id = chat_id
         self.markup = markup
         self.logger = logger
+        self.journal = journal  # Бинарный журнал тиков (TickJournal) или None
+        self.decision = DECISION_NONE  # Решение стратегии на текущем тике
         self.last_bar_time = None
         self.in_position = False
         self.position_side = ""
@@ -79,7 +89,8 @@ class TradingBot:
         if trend == "long" and candle["close"] < candle["ema_fast"] and prev_candle["close"] > prev_candle["ema_fast"]:
             qty = calc_order_qty(cfg.SYMBOL, cfg.POSITION_SIZE)
             self.tg_bot.send_message(self.chat_id, f"{datetime.now().strftime('%H:%M:%S %d-%m-%Y')} [ENTRY] LONG signal. Size {qty}", reply_markup=self.markup)
-            self.logger.info(f" [ENTRY] LONG signal. Size {qty}")
+            self.logger.bind(event="entry", side="Buy", qty=qty, price=candle["close"]).info(f"[ENTRY] LONG signal. Size {qty}")
+            self.decision = DECISION_ENTRY_LONG
             if place_limit_best("Buy", qty, cfg.SYMBOL):
                 self.limit_order_plased = True            
             self.in_position = True
@@ -94,7 +105,8 @@ class TradingBot:
         elif not ONLY_LONG and trend == "short" and candle["close"] > candle["ema_fast"] and prev_candle["close"] < prev_candle["ema_fast"]:
             qty = calc_order_qty(cfg.SYMBOL, cfg.POSITION_SIZE)
             self.tg_bot.send_message(self.chat_id, f"{datetime.now().strftime('%H:%M:%S %d-%m-%Y')} [ENTRY] SHORT signal. Size {qty}", reply_markup=self.markup)
-            self.logger.info(f"[ENTRY] SHORT signal. Size {qty}")
+            self.logger.bind(event="entry", side="Sell", qty=qty, price=candle["close"]).info(f"[ENTRY] SHORT signal. Size {qty}")
+            self.decision = DECISION_ENTRY_SHORT
             if place_limit_best("Sell", qty, cfg.SYMBOL):
                 self.limit_order_plased = True
             self.in_position = True
@@ -135,7 +147,8 @@ class TradingBot:
 
         if should_tp:
             self.tg_bot.send_message(self.chat_id, f"{datetime.now().strftime('%H:%M:%S %d-%m-%Y')} [TP Exit] Closing {side} at {current_price} (avg: {avg_price})", reply_markup=self.markup)
-            self.logger.info(f"[TP Exit] Closing {side} at {current_price} (avg: {avg_price})")
+            self.logger.bind(event="tp_exit", side=side, price=current_price, avg_price=avg_price).info(f"[TP Exit] Closing {side} at {current_price} (avg: {avg_price})")
+            self.decision = DECISION_TP_EXIT
             close_position(cfg.SYMBOL)
             self.reset_position()
 
@@ -148,7 +161,8 @@ class TradingBot:
                     self.is_message_trend_change = True
                 if current_price >= exit_price:
                     self.tg_bot.send_message(self.chat_id, f"{datetime.now().strftime('%H:%M:%S %d-%m-%Y')} [TP Not Loss] Closing {side} at {current_price} (avg: {avg_price})", reply_markup=self.markup)
-                    self.logger.info(f"[TP Not Loss] Closing {side} at {current_price} (avg: {avg_price})")
+                    self.logger.bind(event="not_loss_exit", side=side, price=current_price, avg_price=avg_price).info(f"[TP Not Loss] Closing {side} at {current_price} (avg: {avg_price})")
+                    self.decision = DECISION_NOT_LOSS_EXIT
                     close_position(cfg.SYMBOL)
                     self.reset_position()
 
@@ -160,6 +174,8 @@ class TradingBot:
                     self.is_message_trend_change = True
                 if current_price <= exit_price:
                     self.tg_bot.send_message(self.chat_id, f"{datetime.now().strftime('%H:%M:%S %d-%m-%Y')} [TP Not Loss] Closing {side} at {current_price} (avg: {avg_price})", reply_markup=self.markup)
+                    self.logger.bind(event="not_loss_exit", side=side, price=current_price, avg_price=avg_price).info(f"[TP Not Loss] Closing {side} at {current_price} (avg: {avg_price})")
+                    self.decision = DECISION_NOT_LOSS_EXIT
                     close_position(cfg.SYMBOL)
                     self.reset_position()
 
@@ -196,7 +212,8 @@ class TradingBot:
             qty = calc_order_qty(cfg.SYMBOL, cfg.POSITION_SIZE)
             qty = qty * factor
             self.tg_bot.send_message(self.chat_id, f"{datetime.now().strftime('%H:%M:%S %d-%m-%Y')} [DCA level] Add {side} x{factor} at {current_price}", reply_markup=self.markup)
-            self.logger.info(f"[DCA level] Add {side} x{factor} at {current_price})")
+            self.logger.bind(event="dca", side=side, factor=factor, qty=qty, price=current_price, dca_level=self.dca_index + 1).info(f"[DCA level] Add {side} x{factor} at {current_price}")
+            self.decision = DECISION_DCA
             place_limit_best(side, qty, cfg.SYMBOL)
             self.dca_index += 1
             self.is_message_dca = False
@@ -214,6 +231,31 @@ class TradingBot:
         self.is_message_trend_change = False
         # print('============================================\n')
 
+    def record_tick(self, df: pd.DataFrame):
+        """
+        Запись тика в бинарный журнал: текущая цена, EMA и решение.
+
+        Журнал – необязательная диагностика: при ошибке (диск, битый файл)
+        пишем её в лог один раз и отключаем журнал, не трогая торговлю.
+        """
+        candle = df.iloc[-1]
+        try:
+            self.journal.record(
+                price=candle["close"],
+                ema_fast=candle["ema_fast"],
+                ema_slow=candle["ema_slow"],
+                decision=self.decision,
+                dca_index=self.dca_index,
+                trend=self.last_trend,
+            )
+        except Exception as e:
+            self.logger.error(f"Журнал тиков отключён: {e}")
+            try:
+                self.journal.close()
+            except Exception:
+                pass
+            self.journal = None
+
     def run(self, traiding_flag):
         """
         Главный цикл: следим за свечами, сигналами и позициями.
@@ -221,6 +263,7 @@ class TradingBot:
         if traiding_flag:
             self.is_stoped = False
             try:
+                self.decision = DECISION_NONE
                 df = self.update_candles()
 
                 if self.check_new_candle(df):
@@ -229,6 +272,9 @@ class TradingBot:
                 self.check_exit()
                 self.check_dca()
 
+                if self.journal is not None:
+                    self.record_tick(df)
+
             except Exception as e:
                 self.tg_bot.send_message(self.chat_id, f"[ERROR] {e}", reply_markup=self.markup)
                 self.logger.info(e)